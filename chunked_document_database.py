@@ -14,13 +14,82 @@ Supports:
 """
 
 import os
+import io
+import csv
 import json
-from typing import List, Dict, Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime
+import numpy as np
 import psycopg2
 from psycopg2 import pool, sql
 from psycopg2.extras import execute_values
 
+# Optional fast JSON encoder (pip install orjson); json module otherwise
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Documents with more chunks than this load them with COPY instead of INSERTs
+COPY_CHUNK_THRESHOLD = 10
+
+# Multi-row chunk INSERT shared by the execute_values bulk paths
+CHUNKS_INSERT_VALUES = """
+    INSERT INTO chunks (
+        id, document_id, content, chunk_index,
+        token_count, embedding
+    ) VALUES %s
+"""
+CHUNKS_VALUES_TEMPLATE = "(%s, %s, %s, %s, %s, %s::vector(768))"
+
+# Rows fetched per round trip when streaming documents with a server-side cursor
+STREAM_BATCH_SIZE = 500
+
+DOCUMENTS_WITH_EMBEDDINGS_QUERY = """
+    SELECT
+        d.id,
+        d.title,
+        d.summary,
+        d.category,
+        d.keywords,
+        d.source_urls,
+        d.embedding,
+        LENGTH(d.content) as content_length,
+        COUNT(c.id) as chunk_count
+    FROM documents d
+    LEFT JOIN chunks c ON d.id = c.document_id
+    GROUP BY d.id, d.title, d.summary, d.category, d.keywords, d.source_urls, d.embedding, d.content
+    ORDER BY d.created_at DESC
+"""
+
+
+def _vector_literal(embedding) -> str:
+    """
+    pgvector text form ('[x,y,...]') of an embedding (list or ndarray)
+
+    Written from float32, the precision pgvector stores. orjson serializes
+    the array directly, without building a list of Python floats first.
+    """
+    vec = np.ascontiguousarray(embedding, dtype=np.float32)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(vec, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(vec.tolist())
+
+
+def _chunk_row(document_id: str, chunk: Dict) -> tuple:
+    """Column values for one chunks row (id, document_id, content, chunk_index, token_count, embedding)"""
+    return (
+        chunk.get('id', f"{document_id}_chunk_{chunk['chunk_index']}"),
+        document_id,
+        chunk['content'],
+        chunk['chunk_index'],
+        chunk['token_count'],
+        _vector_literal(chunk['embedding'])
+    )
+
 
 class SimpleDocumentDatabase:
     """
@@ -32,6 +101,13 @@ class SimpleDocumentDatabase:
     - merge_history: Merge tracking
     """
 
+    # Connection pools shared by every instance with the same connection
+    # settings, so creating another database object reuses open connections
+    _pools: Dict[tuple, pool.ThreadedConnectionPool] = {}
+    # Live instances holding each shared pool; the last one to close() shuts it
+    _pool_refs: Dict[tuple, int] = {}
+    _pools_lock = threading.Lock()
+
     def __init__(
         self,
         container_name: str = None,
@@ -59,17 +135,26 @@ class SimpleDocumentDatabase:
         self.host = host
         self.port = port
 
-        # Create connection pool for efficient database access
+        # Create (or reuse) the connection pool for efficient database access
+        pool_key = (self.host, self.port, self.database, self.user)
+        self._pool_key = None
         try:
-            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
+            with self._pools_lock:
+                self.connection_pool = self._pools.get(pool_key)
+                if self.connection_pool is None or self.connection_pool.closed:
+                    self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=10,
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password
+                    )
+                    self._pools[pool_key] = self.connection_pool
+                    self._pool_refs[pool_key] = 0
+                self._pool_refs[pool_key] += 1
+                self._pool_key = pool_key
 
             # Test connection
             conn = self.connection_pool.getconn()
@@ -85,6 +170,7 @@ class SimpleDocumentDatabase:
                 self.connection_pool.putconn(conn)
 
         except psycopg2.Error as e:
+            self._release_pool()
             print(f"❌ Failed to connect to database: {e}")
             print(f"   Falling back to docker exec method...")
             self.connection_pool = None
@@ -235,7 +321,7 @@ class SimpleDocumentDatabase:
             document: Document dict with:
                 - id, title, content, summary, category
                 - keywords (list), source_urls (list)
-                - embedding (list/vector)
+                - embedding (list or numpy array)
                 - chunks (list of chunk dicts with embeddings)
 
         Returns:
@@ -261,13 +347,20 @@ class SimpleDocumentDatabase:
                     document.get('category', 'general'),
                     document.get('keywords', []),
                     document.get('source_urls', []),
-                    json.dumps(document['embedding'])
+                    _vector_literal(document['embedding'])
                 ),
                 fetch=False
             )
 
             # Insert chunks
             chunks = document.get('chunks', [])
+            if chunks and self.connection_pool is not None:
+                if len(chunks) > COPY_CHUNK_THRESHOLD:
+                    self._copy_chunks(document['id'], chunks)
+                else:
+                    self._insert_chunks_values(document['id'], chunks)
+                chunks = []
+
             for chunk in chunks:
                 chunk_query = """
                     INSERT INTO chunks (
@@ -286,7 +379,7 @@ class SimpleDocumentDatabase:
                         chunk['content'],
                         chunk['chunk_index'],
                         chunk['token_count'],
-                        json.dumps(chunk['embedding'])
+                        _vector_literal(chunk['embedding'])
                     ),
                     fetch=False
                 )
@@ -297,6 +390,128 @@ class SimpleDocumentDatabase:
             print(f"  ❌ Error inserting document: {e}")
             return False
 
+    def _copy_chunks(self, document_id: str, chunks: List[Dict]):
+        """
+        Bulk-load chunks for one document with COPY (single round-trip)
+
+        Rows are streamed as CSV; pgvector parses the '[...]' text form of
+        each embedding directly, so no per-row INSERT parse/plan is needed.
+
+        Args:
+            document_id: Parent document ID
+            chunks: Chunk dicts with embeddings
+        """
+        buf = io.StringIO()
+        writer = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC, lineterminator='\n')
+        writer.writerows(_chunk_row(document_id, chunk) for chunk in chunks)
+        buf.seek(0)
+
+        copy_query = """
+            COPY chunks (id, document_id, content, chunk_index, token_count, embedding)
+            FROM STDIN WITH (FORMAT csv)
+        """
+
+        with self._pooled_cursor() as cursor:
+            cursor.copy_expert(copy_query, buf)
+
+    def _insert_chunks_values(self, document_id: str, chunks: List[Dict]):
+        """
+        Insert chunks for one document in a single multi-row INSERT
+
+        Args:
+            document_id: Parent document ID
+            chunks: Chunk dicts with embeddings
+        """
+        rows = [_chunk_row(document_id, chunk) for chunk in chunks]
+
+        with self._pooled_cursor() as cursor:
+            execute_values(cursor, CHUNKS_INSERT_VALUES, rows, template=CHUNKS_VALUES_TEMPLATE, page_size=200)
+
+    def _insert_documents_values(self, documents: List[Dict]):
+        """
+        Insert several documents and all their chunks in one transaction
+
+        One multi-row INSERT for the documents and one for every chunk,
+        instead of a document INSERT plus a chunk INSERT per document.
+
+        Args:
+            documents: Document dicts (same format as insert_document)
+        """
+        doc_rows = [
+            (
+                document['id'],
+                document['title'],
+                document['content'],
+                document.get('summary', ''),
+                document.get('category', 'general'),
+                document.get('keywords', []),
+                document.get('source_urls', []),
+                _vector_literal(document['embedding'])
+            )
+            for document in documents
+        ]
+        chunk_rows = [
+            _chunk_row(document['id'], chunk)
+            for document in documents
+            for chunk in document.get('chunks', [])
+        ]
+
+        with self._pooled_cursor() as cursor:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO documents (
+                    id, title, content, summary, category,
+                    keywords, source_urls, embedding,
+                    created_at, updated_at
+                ) VALUES %s
+                """,
+                doc_rows,
+                template="(%s, %s, %s, %s, %s, %s, %s, %s::vector(768), NOW(), NOW())",
+                page_size=200
+            )
+            if chunk_rows:
+                execute_values(cursor, CHUNKS_INSERT_VALUES, chunk_rows, template=CHUNKS_VALUES_TEMPLATE, page_size=200)
+
+    @contextmanager
+    def _pooled_cursor(self):
+        """
+        Cursor for bulk helpers (COPY / execute_values)
+
+        Reuses the open transaction connection like _execute_query; otherwise
+        borrows a pooled connection and commits (or rolls back) on exit.
+        """
+        if self._transaction_conn:
+            yield self._transaction_cursor
+            return
+
+        conn = self.connection_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                yield cursor
+            conn.commit()
+        except Exception as e:
+            print(f"  ❌ Query failed: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.connection_pool.putconn(conn)
+
+    def _savepoint(self, name: str):
+        """Set a SAVEPOINT in the open transaction (no-op outside transaction())"""
+        if self._transaction_conn:
+            self._transaction_cursor.execute(f"SAVEPOINT {name}")
+
+    def _release_savepoint(self, name: str):
+        """Keep the work done since _savepoint(name)"""
+        if self._transaction_conn:
+            self._transaction_cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+    def _rollback_to_savepoint(self, name: str):
+        """Undo the work done since _savepoint(name), keeping the transaction usable"""
+        if self._transaction_conn:
+            self._transaction_cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+
     def insert_documents_batch(self, documents: List[Dict]) -> Dict:
         """
         Insert multiple documents in batch
@@ -315,10 +530,37 @@ class SimpleDocumentDatabase:
         success_count = 0
         failed_docs = []
 
-        for i, doc in enumerate(documents, 1):
+        # Fast path: every document and chunk in one transaction. If any row
+        # fails it all rolls back and the per-document loop below finds out
+        # which documents are bad, so the good ones are still stored. Inside
+        # an open transaction() both steps run under a SAVEPOINT, otherwise
+        # the first failed row would abort the caller's whole transaction.
+        if self.connection_pool is not None and len(documents) > 1:
+            try:
+                self._savepoint('batch_insert')
+                self._insert_documents_values(documents)
+                self._release_savepoint('batch_insert')
+                success_count = len(documents)
+                print(f"\n  ✅ Inserted {success_count} documents in one transaction")
+                documents_left = []
+            except Exception as e:
+                self._rollback_to_savepoint('batch_insert')
+                print(f"\n  ⚠️  Batch insert failed ({e}), inserting one by one...")
+                documents_left = documents
+        else:
+            documents_left = documents
+
+        for i, doc in enumerate(documents_left, 1):
             print(f"\n[{i}/{len(documents)}] Inserting: {doc.get('title', 'Unknown')}")
 
-            if self.insert_document(doc):
+            self._savepoint('batch_document')
+            inserted = self.insert_document(doc)
+            if inserted:
+                self._release_savepoint('batch_document')
+            else:
+                self._rollback_to_savepoint('batch_document')
+
+            if inserted:
                 success_count += 1
                 print(f"  ✅ Inserted successfully")
             else:
@@ -458,6 +700,64 @@ class SimpleDocumentDatabase:
             traceback.print_exc()
             return None
 
+    def search_similar_documents(
+        self,
+        query_embedding: list,
+        limit: int = 100,
+        min_similarity: float = 0.0
+    ) -> List[Dict]:
+        """
+        Nearest documents by cosine similarity, ranked inside PostgreSQL
+
+        ORDER BY embedding <=> query LIMIT k is served by the HNSW index on
+        documents.embedding (scripts/db_create_vector_indexes.sh), so only
+        the top matches leave the database instead of every embedding.
+
+        Args:
+            query_embedding: Query embedding vector
+            limit: Maximum number of documents to return
+            min_similarity: Minimum cosine similarity to keep
+
+        Returns:
+            List of dicts with id, title, category, similarity (highest first)
+        """
+        try:
+            vector_json = _vector_literal(query_embedding)
+
+            # title last so it can be split off with maxsplit (may contain '|')
+            query = """
+                SELECT id, category, 1 - (embedding <=> %s::vector(768)) AS similarity, title
+                FROM documents
+                WHERE embedding IS NOT NULL
+                ORDER BY embedding <=> %s::vector(768)
+                LIMIT %s
+            """
+
+            results = self._execute_query(query, (vector_json, vector_json, limit))
+
+            documents = []
+            for row in results:
+                parts = row.split('|', maxsplit=3)
+                if len(parts) < 4:
+                    continue
+
+                similarity = float(parts[2]) if parts[2] else 0.0
+                if similarity < min_similarity:
+                    continue
+
+                documents.append({
+                    'id': parts[0],
+                    'category': parts[1],
+                    'similarity': similarity,
+                    'title': parts[3]
+                })
+
+            return documents
+
+        except Exception as e:
+            print(f"  ❌ Error searching similar documents: {e}")
+            return []
+
     def search_parent_documents(
         self,
         query_embedding: list,
@@ -478,8 +778,7 @@ class SimpleDocumentDatabase:
         try:
             # Use the database function we created in schema
             # Use parameterized query to avoid quoting issues
-            import json
-            vector_json = json.dumps(query_embedding)
+            vector_json = _vector_literal(query_embedding)
 
             query = f"""
                 SELECT * FROM search_parent_documents(
@@ -633,10 +932,12 @@ class SimpleDocumentDatabase:
         Returns:
             Success boolean
         """
-        try:
-            # Start transaction
-            self._execute_query("BEGIN", fetch=False)
+        # Join the caller's transaction if one is open; otherwise run in our own
+        owns_transaction = self._transaction_conn is None
+        if owns_transaction:
+            self.begin_transaction()
 
+        try:
             # Update document
             update_query = """
                 UPDATE documents SET
@@ -656,7 +957,7 @@ class SimpleDocumentDatabase:
                     document.get('summary', ''),
                     document.get('keywords', []),
                     document.get('source_urls', []),
-                    json.dumps(document['embedding']),
+                    _vector_literal(document['embedding']),
                     document['id']
                 ),
                 fetch=False
@@ -668,6 +969,10 @@ class SimpleDocumentDatabase:
 
             # Insert new chunks
             chunks = document.get('chunks', [])
+            if chunks and self.connection_pool is not None:
+                self._insert_chunks_values(document['id'], chunks)
+                chunks = []
+
             for chunk in chunks:
                 chunk_query = """
                     INSERT INTO chunks (
@@ -686,7 +991,7 @@ class SimpleDocumentDatabase:
                         chunk['content'],
                         chunk['chunk_index'],
                         chunk['token_count'],
-                        json.dumps(chunk['embedding'])
+                        _vector_literal(chunk['embedding'])
                     ),
                     fetch=False
                 )
@@ -712,13 +1017,15 @@ class SimpleDocumentDatabase:
                 )
 
             # Commit transaction
-            self._execute_query("COMMIT", fetch=False)
+            if owns_transaction:
+                self.commit_transaction()
 
             return True
 
         except Exception as e:
-            # Rollback on error
-            self._execute_query("ROLLBACK", fetch=False)
+            # Rollback on error (an enclosing transaction is rolled back by its owner)
+            if owns_transaction:
+                self.rollback_transaction()
             print(f"  ❌ Error updating document: {e}")
             return False
 
@@ -726,101 +1033,143 @@ class SimpleDocumentDatabase:
         """
         Get all documents with embeddings (for merge decisions)
 
+        Holds every document in memory; callers that only need one pass
+        should use iter_documents_with_embeddings() instead.
+
         Returns:
             List of documents with id, title, summary, keywords, category, embedding, chunk_count, content_length
         """
         try:
-            query = """
-                SELECT
-                    d.id,
-                    d.title,
-                    d.summary,
-                    d.category,
-                    d.keywords,
-                    d.source_urls,
-                    d.embedding,
-                    LENGTH(d.content) as content_length,
-                    COUNT(c.id) as chunk_count
-                FROM documents d
-                LEFT JOIN chunks c ON d.id = c.document_id
-                GROUP BY d.id, d.title, d.summary, d.category, d.keywords, d.source_urls, d.embedding, d.content
-                ORDER BY d.created_at DESC
-            """
+            return list(self.iter_documents_with_embeddings())
 
-            results = self._execute_query(query)
+        except Exception as e:
+            print(f"  ❌ Error getting documents: {e}")
+            return []
 
-            # FIX: Group lines that belong to the same document record
-            # Format: id|title|summary|category|keywords|source_urls|embedding|content_length|chunk_count (9 fields)
-            # Problem: summary can contain newlines, causing split across multiple array elements
-            document_records = []
-            current_record_lines = []
+    def _get_documents_with_embeddings_docker(self) -> List[Dict]:
+        """
+        Documents with embeddings via the docker exec fallback (whole result at once)
 
-            for line in results:
-                # Try to detect if this line ends a complete record
-                # Strategy: A complete record has exactly 9 pipe-separated fields
-                # Check from right: last 6 fields are category|keywords|source_urls|embedding|content_length|chunk_count
-                right_parts = line.rsplit('|', maxsplit=6)
-
-                if len(right_parts) == 7:
-                    # This could be the end of a record
-                    # Validation: keywords and source_urls should be arrays (start with '{')
-                    # embedding should be array (start with '[')
-                    # content_length and chunk_count should be numbers
-                    keywords_field = right_parts[2]
-                    urls_field = right_parts[3]
-                    embedding_field = right_parts[4]
-                    content_len_field = right_parts[5]
-                    chunk_count_field = right_parts[6]
-
-                    # If fields look correct, this is likely a complete record end
-                    if ((keywords_field.startswith('{') or keywords_field == '') and
-                        (urls_field.startswith('{') or urls_field == '') and
-                        (embedding_field.startswith('[') or embedding_field == '') and
-                        content_len_field.isdigit() and chunk_count_field.isdigit()):
-                        # This is the end of a record
-                        current_record_lines.append(line)
-                        full_record = '\n'.join(current_record_lines)
-                        document_records.append(full_record)
-                        current_record_lines = []
-                        continue
+        Returns:
+            List of documents in the same format as get_all_documents_with_embeddings()
+        """
+        results = self._execute_query(DOCUMENTS_WITH_EMBEDDINGS_QUERY)
+
+        # FIX: Group lines that belong to the same document record
+        # Format: id|title|summary|category|keywords|source_urls|embedding|content_length|chunk_count (9 fields)
+        # Problem: summary can contain newlines, causing split across multiple array elements
+        document_records = []
+        current_record_lines = []
+
+        for line in results:
+            # Try to detect if this line ends a complete record
+            # Strategy: A complete record has exactly 9 pipe-separated fields
+            # Check from right: last 6 fields are category|keywords|source_urls|embedding|content_length|chunk_count
+            right_parts = line.rsplit('|', maxsplit=6)
+
+            if len(right_parts) == 7:
+                # This could be the end of a record
+                # Validation: keywords and source_urls should be arrays (start with '{')
+                # embedding should be array (start with '[')
+                # content_length and chunk_count should be numbers
+                keywords_field = right_parts[2]
+                urls_field = right_parts[3]
+                embedding_field = right_parts[4]
+                content_len_field = right_parts[5]
+                chunk_count_field = right_parts[6]
+
+                # If fields look correct, this is likely a complete record end
+                if ((keywords_field.startswith('{') or keywords_field == '') and
+                    (urls_field.startswith('{') or urls_field == '') and
+                    (embedding_field.startswith('[') or embedding_field == '') and
+                    content_len_field.isdigit() and chunk_count_field.isdigit()):
+                    # This is the end of a record
+                    current_record_lines.append(line)
+                    full_record = '\n'.join(current_record_lines)
+                    document_records.append(full_record)
+                    current_record_lines = []
+                    continue
 
-                # Otherwise, accumulate this line
-                current_record_lines.append(line)
+            # Otherwise, accumulate this line
+            current_record_lines.append(line)
+
+        # Handle any remaining lines
+        if current_record_lines:
+            full_record = '\n'.join(current_record_lines)
+            document_records.append(full_record)
+
+        documents = []
+        for row in document_records:
+            # Now parse the complete record
+            # Split from right to preserve newlines in summary field
+            right_parts = row.rsplit('|', maxsplit=6)
+
+            if len(right_parts) >= 7:
+                # Split the left part to get id and title
+                left_parts = right_parts[0].split('|', maxsplit=2)
+
+                if len(left_parts) >= 3:
+                    doc = {
+                        'id': left_parts[0],
+                        'title': left_parts[1],
+                        'summary': left_parts[2],  # Can contain newlines
+                        'category': right_parts[1],
+                        'keywords': self._parse_array(right_parts[2]) if right_parts[2] != '' else [],
+                        'source_urls': self._parse_array(right_parts[3]) if right_parts[3] != '' else [],
+                        'embedding': self._parse_vector(right_parts[4]) if right_parts[4] and right_parts[4] != '' else None,
+                        'content_length': int(right_parts[5]) if right_parts[5].isdigit() else 0,
+                        'chunk_count': int(right_parts[6]) if right_parts[6].isdigit() else 0
+                    }
+                    documents.append(doc)
+
+        return documents
+
+    def iter_documents_with_embeddings(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Dict]:
+        """
+        Stream documents with embeddings through a server-side cursor
 
-            # Handle any remaining lines
-            if current_record_lines:
-                full_record = '\n'.join(current_record_lines)
-                document_records.append(full_record)
+        Rows arrive in batches of batch_size, so only one batch is held in
+        memory and each batch is parsed while the next is in flight. With the
+        docker exec fallback (no connection pool) the whole result is read at
+        once and then yielded.
 
-            documents = []
-            for row in document_records:
-                # Now parse the complete record
-                # Split from right to preserve newlines in summary field
-                right_parts = row.rsplit('|', maxsplit=6)
-
-                if len(right_parts) >= 7:
-                    # Split the left part to get id and title
-                    left_parts = right_parts[0].split('|', maxsplit=2)
-
-                    if len(left_parts) >= 3:
-                        doc = {
-                            'id': left_parts[0],
-                            'title': left_parts[1],
-                            'summary': left_parts[2],  # Can contain newlines
-                            'category': right_parts[1],
-                            'keywords': self._parse_array(right_parts[2]) if right_parts[2] != '' else [],
-                            'source_urls': self._parse_array(right_parts[3]) if right_parts[3] != '' else [],
-                            'embedding': self._parse_vector(right_parts[4]) if right_parts[4] and right_parts[4] != '' else None,
-                            'content_length': int(right_parts[5]) if right_parts[5].isdigit() else 0,
-                            'chunk_count': int(right_parts[6]) if right_parts[6].isdigit() else 0
-                        }
-                        documents.append(doc)
+        Args:
+            batch_size: Rows fetched per round trip
 
-            return documents
+        Yields:
+            Document dicts with the same keys as get_all_documents_with_embeddings()
+        """
+        if self.connection_pool is None:
+            yield from self._get_documents_with_embeddings_docker()
+            return
 
-        except Exception as e:
-            print(f"  ❌ Error getting documents: {e}")
-            return []
+        # Read through the open transaction (if any) so its writes are visible
+        owns_connection = self._transaction_conn is None
+        conn = self.connection_pool.getconn() if owns_connection else self._transaction_conn
+
+        try:
+            with conn.cursor(name='documents_with_embeddings') as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(DOCUMENTS_WITH_EMBEDDINGS_QUERY)
+
+                # NULLs coerced like the pipe-separated fallback parser does
+                for row in cursor:
+                    yield {
+                        'id': row[0],
+                        'title': row[1] or '',
+                        'summary': row[2] or '',
+                        'category': row[3] or '',
+                        'keywords': row[4] or [],
+                        'source_urls': row[5] or [],
+                        'embedding': self._parse_vector(row[6]) if row[6] else None,
+                        'content_length': row[7] or 0,
+                        'chunk_count': row[8] or 0
+                    }
+        finally:
+            if owns_connection:
+                # Read-only; ends the transaction the named cursor needed
+                conn.rollback()
+                self.connection_pool.putconn(conn)
 
     def _parse_array(self, array_str: str) -> List[str]:
         """Parse PostgreSQL array string to Python list"""
@@ -836,8 +1185,6 @@ class SimpleDocumentDatabase:
 
     def _parse_vector(self, vector_str: str) -> List[float]:
         """Parse PostgreSQL vector string to Python list of floats"""
-        import json
-
         if not vector_str or vector_str == '':
             return None
 
@@ -848,6 +1195,27 @@ class SimpleDocumentDatabase:
             print(f"  ⚠️  Error parsing vector: {e}")
             return None
 
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one transaction (a single commit)
+
+        Commits when the block exits normally, rolls back if it raises.
+
+        Usage:
+            with db.transaction():
+                db.insert_document(doc)
+                db.update_document_with_chunks(doc)
+        """
+        self.begin_transaction()
+        try:
+            yield self
+        except Exception:
+            self.rollback_transaction()
+            raise
+        else:
+            self.commit_transaction()
+
     def begin_transaction(self):
         """
         Begin database transaction
@@ -930,19 +1298,50 @@ class SimpleDocumentDatabase:
             print(f"  ❌ Error getting stats: {e}")
             return {}
 
+    def _release_pool(self) -> bool:
+        """
+        Drop this instance's reference to the shared connection pool
+
+        The pool is closed and removed from the registry when the last
+        instance using it lets go, so other live instances keep working and
+        the next new instance opens a fresh pool.
+
+        Returns:
+            True if this call closed the pool
+        """
+        pool_key = getattr(self, '_pool_key', None)
+        if pool_key is None:
+            return False
+        self._pool_key = None
+
+        with self._pools_lock:
+            self._pool_refs[pool_key] -= 1
+            if self._pool_refs[pool_key] > 0:
+                return False
+            del self._pool_refs[pool_key]
+            shared_pool = self._pools.pop(pool_key, None)
+
+        if shared_pool is not None and not shared_pool.closed:
+            shared_pool.closeall()
+            return True
+        return False
+
     def close(self):
-        """Close all database connections and cleanup connection pool"""
-        if self.connection_pool:
-            self.connection_pool.closeall()
+        """
+        Release this instance's database connections
+
+        The pool is shared with other instances using the same connection
+        settings; it is closed once the last of them calls close().
+        """
+        if self._release_pool():
             print("✅ Database connections closed")
 
     def __del__(self):
         """Cleanup on deletion"""
-        if hasattr(self, 'connection_pool') and self.connection_pool:
-            try:
-                self.connection_pool.closeall()
-            except:
-                pass
+        try:
+            self._release_pool()
+        except Exception:
+            pass
 
 
 # Backwards compatibility: create alias
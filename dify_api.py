@@ -281,8 +281,8 @@ def info():
 
     # Count available data
     try:
-        doc_count = len(db.get_all_documents_with_embeddings())
         stats = db.get_stats()
+        doc_count = stats.get('total_documents', 'unknown')
         chunk_count = stats.get('total_chunks', 0)
     except:
         doc_count = "unknown"
@@ -17,6 +17,8 @@ import google.generativeai as genai
 from datetime import datetime
 from simple_quality_chunker import SimpleQualityChunker
 from utils.rate_limiter import get_embedding_rate_limiter
+from utils.embedding_parser import parse_batch_result
+from utils import embedding_cache
 
 
 class DocumentCreator:
@@ -63,6 +65,10 @@ class DocumentCreator:
         Returns:
             768-dimensional embedding vector
         """
+        cached = embedding_cache.get(text)
+        if cached is not None:
+            return cached
+
         try:
             self.embedding_limiter.wait_if_needed()
             result = genai.embed_content(
@@ -70,6 +76,7 @@ class DocumentCreator:
                 content=text,
                 task_type="retrieval_document"
             )
+            embedding_cache.put(text, result['embedding'])
             return result['embedding']
         except Exception as e:
             print(f"  ⚠️  Embedding generation failed: {e}")
@@ -92,6 +99,18 @@ class DocumentCreator:
         if not texts:
             return []
 
+        # Only call the API for texts not already embedded in this process
+        embeddings, missing = embedding_cache.lookup(texts)
+        if missing:
+            fresh = self._embed_texts_uncached([texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                embedding_cache.put(texts[i], embedding)
+
+        return embeddings
+
+    def _embed_texts_uncached(self, texts: list) -> list:
+        """Batch-embed texts via the API (see create_embeddings_batch)."""
         # Check if batch embedding is enabled (default: True)
         batch_enabled = os.getenv('BATCH_EMBEDDING_ENABLED', 'True').lower() == 'true'
 
@@ -106,7 +125,7 @@ class DocumentCreator:
         # Get batch size from environment (default: 100, Gemini's maximum)
         BATCH_SIZE = int(os.getenv('BATCH_SIZE', '100'))
         BATCH_SIZE = min(BATCH_SIZE, 100)  # Ensure it doesn't exceed Gemini's limit
-        all_embeddings = []
+        embeddings = []
 
         try:
             # Process in batches of 100
@@ -123,91 +142,18 @@ class DocumentCreator:
                     task_type="retrieval_document"
                 )
 
-                # DEBUG: Log what we received
-                print(f"  🔍 DEBUG: Batch size={len(batch)}, Result type={type(result)}")
-                if hasattr(result, 'embedding'):
-                    print(f"  🔍 DEBUG: result.embedding exists, type={type(result.embedding)}")
-                if hasattr(result, 'embeddings'):
-                    print(f"  🔍 DEBUG: result.embeddings exists, count={len(result.embeddings)}")
-
                 # Extract embeddings from result - Gemini returns different formats
-                if hasattr(result, 'embedding'):
-                    # Single embedding via attribute (batch of 1)
-                    emb = result.embedding
-                    if isinstance(emb, list) and len(emb) > 0 and isinstance(emb[0], list):
-                        # Nested structure detected
-                        # Check if it's double-nested: [[emb1, emb2, emb3, ...]] (all embeddings in one wrapper)
-                        if len(emb) == 1 and isinstance(emb[0], list) and len(emb[0]) == len(batch):
-                            # Double-nested case: [[emb1, emb2, ...]] where inner list has ALL embeddings
-                            print(f"  🔍 DEBUG: Detected double-nested format, flattening...")
-                            all_embeddings.extend(emb[0])  # Extract the inner list with all embeddings
-                        else:
-                            # Regular nested: [[emb1], [emb2], [emb3], ...] (each embedding wrapped separately)
-                            all_embeddings.extend(emb)
-                    else:
-                        # Flat: [...]
-                        all_embeddings.append(emb)
-                elif hasattr(result, 'embeddings'):
-                    # Multiple embeddings via attribute
-                    for emb in result.embeddings:
-                        if hasattr(emb, 'values'):
-                            all_embeddings.append(emb.values)
-                        elif isinstance(emb, list):
-                            all_embeddings.append(emb)
-                        else:
-                            all_embeddings.append(list(emb))
-                elif isinstance(result, dict) and 'embedding' in result:
-                    # Dict with 'embedding' key
-                    emb = result['embedding']
-                    print(f"  🔍 DEBUG: Dict with 'embedding', type={type(emb)}, len={len(emb) if isinstance(emb, list) else 'N/A'}")
-
-                    # Check if it contains multiple embeddings or single embedding
-                    if isinstance(emb, list) and len(emb) > 0:
-                        # Could be: [emb1, emb2, ...] or [[emb1], [emb2], ...]
-                        if isinstance(emb[0], list):
-                            # Multiple embeddings, each wrapped: [[emb1], [emb2], ...]
-                            # Apply the same double-nested check
-                            if len(emb) == 1 and len(emb[0]) == len(batch):
-                                print(f"  🔍 DEBUG: Dict double-nested format detected")
-                                all_embeddings.extend(emb[0])
-                            else:
-                                all_embeddings.extend(emb)
-                        elif len(emb) == len(batch):
-                            # Multiple flat embeddings: [emb1, emb2, ...]
-                            # But emb1, emb2 are NOT lists (just single values)
-                            # This is ambiguous - could be one embedding with batch_size dimensions
-                            # OR batch_size embeddings with 1 dimension each
-                            # Check if first element looks like an embedding (has multiple values)
-                            if hasattr(emb[0], '__len__') and len(emb[0]) > 1:
-                                # Looks like multiple embeddings
-                                all_embeddings.extend(emb)
-                            else:
-                                # Single embedding vector
-                                all_embeddings.append(emb)
-                        else:
-                            # Single embedding vector
-                            all_embeddings.append(emb)
-                    else:
-                        # Single embedding
-                        all_embeddings.append(emb)
-                elif isinstance(result, dict) and 'embeddings' in result:
-                    # Dict with multiple embeddings
-                    for emb_data in result['embeddings']:
-                        if isinstance(emb_data, dict) and 'values' in emb_data:
-                            all_embeddings.append(emb_data['values'])
-                        elif isinstance(emb_data, list):
-                            all_embeddings.append(emb_data)
-                        else:
-                            all_embeddings.append(list(emb_data))
-                elif isinstance(result, list):
-                    # Direct list of embeddings [[...], [...]]
-                    all_embeddings.extend(result)
+                matrix = parse_batch_result(result, batch)
+
+                if matrix.shape[0] == len(batch):
+                    # Downstream (JSON/pgvector, truthiness checks) expects plain lists
+                    embeddings.extend(matrix.tolist())
                 else:
-                    # Unknown format - try to convert
-                    print(f"  ⚠️  Unknown embedding result format: {type(result)}")
-                    all_embeddings.extend(list(result))
+                    # Only this batch came back short (or empty): embed its texts one by one
+                    print(f"  ⚠️  Batch returned {matrix.shape[0]} embeddings for {len(batch)} texts, embedding them one by one...")
+                    embeddings.extend(self.create_embedding(text) for text in batch)
 
-            return all_embeddings
+            return embeddings
 
         except Exception as e:
             print(f"  ⚠️  Batch embedding generation failed: {e}")
@@ -220,7 +166,13 @@ class DocumentCreator:
                 embeddings.append(emb)
             return embeddings
 
-    def create_document(self, topic: Dict) -> Optional[Dict]:
+    def create_document(
+        self,
+        topic: Dict,
+        doc_embedding: Optional[List[float]] = None,
+        chunks: Optional[List[Dict]] = None,
+        chunk_embeddings: Optional[List[List[float]]] = None
+    ) -> Optional[Dict]:
         """
         Create document from topic using extracted content directly
 
@@ -232,6 +184,12 @@ class DocumentCreator:
                 - keywords: List of keywords
                 - category: Category
                 - source_url: Optional source URL
+            doc_embedding: Precomputed summary embedding (from a batch call).
+                Generated here when not provided.
+            chunks: Precomputed chunks of the topic content. Chunked here
+                when not provided.
+            chunk_embeddings: Embeddings for ``chunks``, in the same order.
+                Generated here when not provided.
 
         Returns:
             Document dictionary with chunks and embeddings
@@ -254,17 +212,23 @@ class DocumentCreator:
             doc_id = f"{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
             # Generate embedding for document (uses summary for semantic matching)
-            print(f"  🔢 Generating document embedding...")
             summary = topic.get('summary', content[:500])
-            doc_embedding = self.create_embedding(summary)
+            if doc_embedding is None:
+                print(f"  🔢 Generating document embedding...")
+                doc_embedding = self.create_embedding(summary)
 
             if not doc_embedding:
                 print(f"  ⚠️  Failed to generate document embedding")
                 return None
 
             # Create quality chunks for precise matching
-            print(f"  ✂️  Creating quality chunks...")
-            chunks = self.chunker.chunk(content, document_id=doc_id)
+            if chunks is None:
+                print(f"  ✂️  Creating quality chunks...")
+                chunks = self.chunker.chunk(content, document_id=doc_id)
+            else:
+                # Chunked before the document ID existed - stamp the IDs now
+                for chunk in chunks:
+                    chunk['id'] = f"{doc_id}_chunk_{chunk['chunk_index']}"
 
             if not chunks:
                 print(f"  ⚠️  No chunks created (content too short?)")
@@ -272,12 +236,13 @@ class DocumentCreator:
 
             print(f"  ✅ Created {len(chunks)} quality chunks")
 
-            # Generate embeddings for chunks using BATCH API (99% cost reduction!)
-            print(f"  🔢 Generating chunk embeddings (batch mode)...")
-            chunk_texts = [chunk['content'] for chunk in chunks]
+            if chunk_embeddings is None:
+                # Generate embeddings for chunks using BATCH API (99% cost reduction!)
+                print(f"  🔢 Generating chunk embeddings (batch mode)...")
+                chunk_texts = [chunk['content'] for chunk in chunks]
 
-            # Call batch API - generates ALL embeddings in 1-2 API calls instead of N calls
-            chunk_embeddings = self.create_embeddings_batch(chunk_texts)
+                # Call batch API - generates ALL embeddings in 1-2 API calls instead of N calls
+                chunk_embeddings = self.create_embeddings_batch(chunk_texts)
 
             # Attach embeddings to chunks
             chunks_with_embeddings = []
@@ -369,10 +334,42 @@ class DocumentCreator:
         documents = []
         failed_topics = []
 
+        # Chunk every topic once, then embed all document summaries and chunk
+        # texts in one batch call instead of separate calls per topic. The
+        # chunks and their embeddings are handed to create_document() below.
+        summary_embeddings = [None] * len(topics)
+        topic_chunks = [None] * len(topics)
+        topic_chunk_embeddings = [None] * len(topics)
+        summary_indices = []
+        summaries = []
+        chunk_texts = []
+        for i, topic in enumerate(topics):
+            content = topic.get('content', topic.get('description', ''))
+            if content:
+                summary_indices.append(i)
+                summaries.append(topic.get('summary', content[:500]))
+                topic_chunks[i] = self.chunker.chunk(content)
+                chunk_texts.extend(chunk['content'] for chunk in topic_chunks[i])
+
+        if summaries:
+            print(f"🔢 Generating {len(summaries)} document and {len(chunk_texts)} chunk embeddings (batch mode)...")
+            embeddings = self.create_embeddings_batch(summaries + chunk_texts)
+            offset = len(summaries)
+            for i, embedding in zip(summary_indices, embeddings):
+                summary_embeddings[i] = embedding
+                n_chunks = len(topic_chunks[i])
+                topic_chunk_embeddings[i] = embeddings[offset:offset + n_chunks]
+                offset += n_chunks
+
         for i, topic in enumerate(topics, 1):
             print(f"\n[{i}/{len(topics)}]", end=" ")
 
-            doc = self.create_document(topic)
+            doc = self.create_document(
+                topic,
+                doc_embedding=summary_embeddings[i - 1],
+                chunks=topic_chunks[i - 1],
+                chunk_embeddings=topic_chunk_embeddings[i - 1]
+            )
 
             if doc:
                 documents.append(doc)
@@ -20,6 +20,8 @@ from datetime import datetime
 import json
 from simple_quality_chunker import SimpleQualityChunker
 from utils.rate_limiter import get_llm_rate_limiter, get_embedding_rate_limiter
+from utils.embedding_parser import parse_batch_result
+from utils import embedding_cache
 
 
 class DocumentMerger:
@@ -69,6 +71,10 @@ class DocumentMerger:
         Returns:
             768-dimensional embedding vector
         """
+        cached = embedding_cache.get(text)
+        if cached is not None:
+            return cached
+
         try:
             self.embedding_limiter.wait_if_needed()
             result = genai.embed_content(
@@ -76,6 +82,7 @@ class DocumentMerger:
                 content=text,
                 task_type="retrieval_document"
             )
+            embedding_cache.put(text, result['embedding'])
             return result['embedding']
         except Exception as e:
             print(f"  ⚠️  Embedding generation failed: {e}")
@@ -98,6 +105,18 @@ class DocumentMerger:
         if not texts:
             return []
 
+        # Only call the API for texts not already embedded in this process
+        embeddings, missing = embedding_cache.lookup(texts)
+        if missing:
+            fresh = self._embed_texts_uncached([texts[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                embedding_cache.put(texts[i], embedding)
+
+        return embeddings
+
+    def _embed_texts_uncached(self, texts: list) -> list:
+        """Batch-embed texts via the API (see create_embeddings_batch)."""
         # Check if batch embedding is enabled (default: True)
         batch_enabled = os.getenv('BATCH_EMBEDDING_ENABLED', 'True').lower() == 'true'
 
@@ -112,7 +131,7 @@ class DocumentMerger:
         # Get batch size from environment (default: 100, Gemini's maximum)
         BATCH_SIZE = int(os.getenv('BATCH_SIZE', '100'))
         BATCH_SIZE = min(BATCH_SIZE, 100)  # Ensure it doesn't exceed Gemini's limit
-        all_embeddings = []
+        embeddings = []
 
         try:
             # Process in batches of 100
@@ -129,91 +148,18 @@ class DocumentMerger:
                     task_type="retrieval_document"
                 )
 
-                # DEBUG: Log what we received
-                print(f"  🔍 DEBUG: Batch size={len(batch)}, Result type={type(result)}")
-                if hasattr(result, 'embedding'):
-                    print(f"  🔍 DEBUG: result.embedding exists, type={type(result.embedding)}")
-                if hasattr(result, 'embeddings'):
-                    print(f"  🔍 DEBUG: result.embeddings exists, count={len(result.embeddings)}")
-
                 # Extract embeddings from result - Gemini returns different formats
-                if hasattr(result, 'embedding'):
-                    # Single embedding via attribute (batch of 1)
-                    emb = result.embedding
-                    if isinstance(emb, list) and len(emb) > 0 and isinstance(emb[0], list):
-                        # Nested structure detected
-                        # Check if it's double-nested: [[emb1, emb2, emb3, ...]] (all embeddings in one wrapper)
-                        if len(emb) == 1 and isinstance(emb[0], list) and len(emb[0]) == len(batch):
-                            # Double-nested case: [[emb1, emb2, ...]] where inner list has ALL embeddings
-                            print(f"  🔍 DEBUG: Detected double-nested format, flattening...")
-                            all_embeddings.extend(emb[0])  # Extract the inner list with all embeddings
-                        else:
-                            # Regular nested: [[emb1], [emb2], [emb3], ...] (each embedding wrapped separately)
-                            all_embeddings.extend(emb)
-                    else:
-                        # Flat: [...]
-                        all_embeddings.append(emb)
-                elif hasattr(result, 'embeddings'):
-                    # Multiple embeddings via attribute
-                    for emb in result.embeddings:
-                        if hasattr(emb, 'values'):
-                            all_embeddings.append(emb.values)
-                        elif isinstance(emb, list):
-                            all_embeddings.append(emb)
-                        else:
-                            all_embeddings.append(list(emb))
-                elif isinstance(result, dict) and 'embedding' in result:
-                    # Dict with 'embedding' key
-                    emb = result['embedding']
-                    print(f"  🔍 DEBUG: Dict with 'embedding', type={type(emb)}, len={len(emb) if isinstance(emb, list) else 'N/A'}")
-
-                    # Check if it contains multiple embeddings or single embedding
-                    if isinstance(emb, list) and len(emb) > 0:
-                        # Could be: [emb1, emb2, ...] or [[emb1], [emb2], ...]
-                        if isinstance(emb[0], list):
-                            # Multiple embeddings, each wrapped: [[emb1], [emb2], ...]
-                            # Apply the same double-nested check
-                            if len(emb) == 1 and len(emb[0]) == len(batch):
-                                print(f"  🔍 DEBUG: Dict double-nested format detected")
-                                all_embeddings.extend(emb[0])
-                            else:
-                                all_embeddings.extend(emb)
-                        elif len(emb) == len(batch):
-                            # Multiple flat embeddings: [emb1, emb2, ...]
-                            # But emb1, emb2 are NOT lists (just single values)
-                            # This is ambiguous - could be one embedding with batch_size dimensions
-                            # OR batch_size embeddings with 1 dimension each
-                            # Check if first element looks like an embedding (has multiple values)
-                            if hasattr(emb[0], '__len__') and len(emb[0]) > 1:
-                                # Looks like multiple embeddings
-                                all_embeddings.extend(emb)
-                            else:
-                                # Single embedding vector
-                                all_embeddings.append(emb)
-                        else:
-                            # Single embedding vector
-                            all_embeddings.append(emb)
-                    else:
-                        # Single embedding
-                        all_embeddings.append(emb)
-                elif isinstance(result, dict) and 'embeddings' in result:
-                    # Dict with multiple embeddings
-                    for emb_data in result['embeddings']:
-                        if isinstance(emb_data, dict) and 'values' in emb_data:
-                            all_embeddings.append(emb_data['values'])
-                        elif isinstance(emb_data, list):
-                            all_embeddings.append(emb_data)
-                        else:
-                            all_embeddings.append(list(emb_data))
-                elif isinstance(result, list):
-                    # Direct list of embeddings [[...], [...]]
-                    all_embeddings.extend(result)
+                matrix = parse_batch_result(result, batch)
+
+                if matrix.shape[0] == len(batch):
+                    # Downstream (JSON/pgvector, truthiness checks) expects plain lists
+                    embeddings.extend(matrix.tolist())
                 else:
-                    # Unknown format - try to convert
-                    print(f"  ⚠️  Unknown embedding result format: {type(result)}")
-                    all_embeddings.extend(list(result))
+                    # Only this batch came back short (or empty): embed its texts one by one
+                    print(f"  ⚠️  Batch returned {matrix.shape[0]} embeddings for {len(batch)} texts, embedding them one by one...")
+                    embeddings.extend(self.create_embedding(text) for text in batch)
 
-            return all_embeddings
+            return embeddings
 
         except Exception as e:
             print(f"  ⚠️  Batch embedding generation failed: {e}")
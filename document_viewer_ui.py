@@ -488,24 +488,25 @@ def index():
             'avg_chunks_per_doc': 0.0
         }
 
-    # Get documents
-    all_docs = db.get_all_documents_with_embeddings()
-
-    # Filter by query if provided
+    # Filter by query if provided (streamed, so only the matches are kept)
     if query:
         query_lower = query.lower()
         documents = []
-        for doc in all_docs:
-            title = doc.get('title', '').lower()
-            keywords = [k.lower() for k in doc.get('keywords', [])]
-            summary = doc.get('summary', '').lower()
-
-            if (query_lower in title or
-                any(query_lower in k for k in keywords) or
-                query_lower in summary):
-                documents.append(doc)
+        try:
+            for doc in db.iter_documents_with_embeddings():
+                title = doc.get('title', '').lower()
+                keywords = [k.lower() for k in doc.get('keywords', [])]
+                summary = doc.get('summary', '').lower()
+
+                if (query_lower in title or
+                    any(query_lower in k for k in keywords) or
+                    query_lower in summary):
+                    documents.append(doc)
+        except Exception as e:
+            print(f"  ❌ Error getting documents: {e}")
+            documents = []
     else:
-        documents = all_docs
+        documents = db.get_all_documents_with_embeddings()
 
     return render_template_string(
         INDEX_TEMPLATE,
@@ -12,9 +12,36 @@ os.environ['GRPC_VERBOSITY'] = 'ERROR'
 os.environ['GLOG_minloglevel'] = '2'
 
 from typing import List, Dict, Tuple, Optional
+import numpy as np
 import google.generativeai as genai
 from datetime import datetime
 
+# Optional SIMD cosine kernels (pip install simsimd); numpy matmul otherwise
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+# Optional JIT-compiled scoring kernel (pip install numba); numpy matmul otherwise
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+EMBEDDING_DIM = 768  # text-embedding-004
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _cos768(q, M, out):
+        # Constant trip count lets LLVM fully vectorize the inner loop
+        for i in numba.prange(M.shape[0]):
+            s = numba.float32(0.0)
+            for j in range(EMBEDDING_DIM):
+                s += q[j] * M[i, j]
+            out[i] = s
+
 
 class EmbeddingSearcher:
     """
@@ -75,6 +102,21 @@ class EmbeddingSearcher:
             print(f"  ❌ Embedding error: {e}")
             return None
 
+    @staticmethod
+    def normalize(embedding: List[float]) -> np.ndarray:
+        """
+        Scale an embedding to unit length
+
+        Args:
+            embedding: Embedding vector
+
+        Returns:
+            float32 unit vector (unchanged if the norm is zero)
+        """
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
         Calculate cosine similarity between two embeddings
@@ -86,27 +128,59 @@ class EmbeddingSearcher:
         Returns:
             Similarity score (0-1)
         """
-        if not embedding1 or not embedding2:
+        if embedding1 is None or embedding2 is None or len(embedding1) == 0 or len(embedding2) == 0:
             return 0.0
 
-        # Cosine similarity
-        import math
-
-        dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
-        magnitude1 = math.sqrt(sum(a * a for a in embedding1))
-        magnitude2 = math.sqrt(sum(b * b for b in embedding2))
-
-        if magnitude1 == 0 or magnitude2 == 0:
+        vec1 = np.asarray(embedding1, dtype=np.float32)
+        vec2 = np.asarray(embedding2, dtype=np.float32)
+        magnitude = float(np.linalg.norm(vec1) * np.linalg.norm(vec2))
+        if magnitude == 0:
             return 0.0
 
-        similarity = dot_product / (magnitude1 * magnitude2)
+        similarity = float(np.dot(vec1, vec2)) / magnitude
         return max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
 
+    def similarity_scores(self, query_embedding: List[float], doc_embeddings) -> np.ndarray:
+        """
+        Cosine similarity of one query against many stored embeddings in one matmul
+
+        Args:
+            query_embedding: Query embedding vector
+            doc_embeddings: Document embeddings (list of vectors or (N, dim) matrix);
+                normalized here, so stored rows need not be unit length
+
+        Returns:
+            (N,) float32 array of scores clamped to [0, 1]
+        """
+        matrix = np.asarray(doc_embeddings, dtype=np.float32)
+        if matrix.size == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        # Normalize rows and query once, so every backend below computes the
+        # same dot product of unit vectors, whichever optional library is
+        # installed (embeddings are stored as returned by the API)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        query = self.normalize(query_embedding)
+
+        if SIMSIMD_AVAILABLE:
+            scores = np.asarray(simsimd.cdist(query[np.newaxis, :], matrix, metric='dot'))[0].astype(np.float32)
+        elif NUMBA_AVAILABLE and matrix.shape[1] == EMBEDDING_DIM and query.shape[0] == EMBEDDING_DIM:
+            # The kernel is unrolled for exactly 768 dims, so the query must
+            # match too. Compiled (or loaded from numba's cache) on first use.
+            scores = np.empty(matrix.shape[0], dtype=np.float32)
+            _cos768(query, matrix, scores)
+        else:
+            scores = matrix @ query
+
+        return np.clip(scores, 0.0, 1.0)
+
     def find_similar_documents(
         self,
         new_topic: Dict,
         existing_documents: List[Dict],
-        mode_filter: str = None
+        mode_filter: str = None,
+        top_k: int = None
     ) -> List[Tuple[Dict, float, str]]:
         """
         Find similar documents and determine action for each
@@ -133,9 +207,10 @@ class EmbeddingSearcher:
                 NOTE: Can be empty list when using PostgreSQL mode (queries DB directly)
             mode_filter: Optional mode to filter documents by ("paragraph" or "full-doc")
                         If specified, only compare with documents of this mode
+            top_k: Only return the k most similar documents (all of them if None)
 
         Returns:
-            List of (document, similarity, action) tuples
+            List of (document, similarity, action) tuples, highest similarity first
             action: "merge", "create", or "verify"
         """
         # Create embedding for new topic (use summary for embedding)
@@ -145,18 +220,19 @@ class EmbeddingSearcher:
 
         # Use PostgreSQL vector search if enabled and database is available
         if self.use_postgres_search and self.db:
-            return self._find_similar_documents_postgres(new_topic, new_embedding, mode_filter)
+            return self._find_similar_documents_postgres(new_topic, new_embedding, mode_filter, top_k)
         else:
             # Python fallback mode: Check if there are documents to compare
             if not existing_documents:
                 return [(None, 0.0, "create")]
-            return self._find_similar_documents_python(new_topic, new_embedding, existing_documents, mode_filter)
+            return self._find_similar_documents_python(new_topic, new_embedding, existing_documents, mode_filter, top_k)
 
     def _find_similar_documents_postgres(
         self,
         new_topic: Dict,
         new_embedding: List[float],
-        mode_filter: str = None
+        mode_filter: str = None,
+        top_k: int = None
     ) -> List[Tuple[Dict, float, str]]:
         """
         Find similar documents using PostgreSQL vector search (200-600x faster)
@@ -164,27 +240,23 @@ class EmbeddingSearcher:
         Args:
             new_topic: New topic to process
             new_embedding: Embedding vector for the new topic
-            mode_filter: Optional mode to filter documents by
+            mode_filter: Ignored here: the database write path does not store a
+                document mode, so there is nothing to filter on
+            top_k: Only return the k most similar documents (top 100 if None)
 
         Returns:
             List of (document, similarity, action) tuples
         """
-        if mode_filter:
-            print(f"\n  🔍 Searching for similar documents to: {new_topic['title']} (mode: {mode_filter})")
-        else:
-            print(f"\n  🔍 Searching for similar documents to: {new_topic['title']}")
+        print(f"\n  🔍 Searching for similar documents to: {new_topic['title']}")
 
         # Search using PostgreSQL (returns all documents, we'll filter by thresholds)
         similar_docs = self.db.search_similar_documents(
             query_embedding=new_embedding,
-            mode=mode_filter,
-            limit=100,  # Get top 100 to ensure we find all potential matches
+            limit=top_k or 100,  # Get top 100 to ensure we find all potential matches
             min_similarity=0.0  # We'll apply thresholds ourselves
         )
 
         if not similar_docs:
-            if mode_filter:
-                print(f"  ℹ️  No existing documents with mode '{mode_filter}' - will CREATE")
             return [(None, 0.0, "create")]
 
         # Convert to results format and determine actions
@@ -214,7 +286,8 @@ class EmbeddingSearcher:
         new_topic: Dict,
         new_embedding: List[float],
         existing_documents: List[Dict],
-        mode_filter: str = None
+        mode_filter: str = None,
+        top_k: int = None
     ) -> List[Tuple[Dict, float, str]]:
         """
         Find similar documents using Python cosine similarity (legacy fallback)
@@ -224,6 +297,7 @@ class EmbeddingSearcher:
             new_embedding: Embedding vector for the new topic
             existing_documents: List of existing documents
             mode_filter: Optional mode to filter documents by
+            top_k: Only return the k most similar documents (all of them if None)
 
         Returns:
             List of (document, similarity, action) tuples
@@ -239,8 +313,9 @@ class EmbeddingSearcher:
         else:
             print(f"\n  🔍 Searching for similar documents to: {new_topic['title']}")
 
-        # Calculate similarity with each existing document
-        results = []
+        # Collect embeddings for each existing document
+        scored_docs = []
+        doc_embeddings = []
 
         for doc in existing_documents:
             # Use pre-computed embedding if available, otherwise create new one
@@ -255,9 +330,24 @@ class EmbeddingSearcher:
                 if not doc_embedding:
                     continue
 
-            # Calculate similarity
-            similarity = self.calculate_similarity(new_embedding, doc_embedding)
+            scored_docs.append(doc)
+            doc_embeddings.append(doc_embedding)
+
+        # Score all documents at once (normalized and scored in one matrix-vector product)
+        scores = self.similarity_scores(new_embedding, doc_embeddings)
 
+        # Highest similarity first. With top_k, argpartition selects those k
+        # in O(N) and only they are sorted, instead of sorting every score.
+        if top_k and top_k < len(scores):
+            order = np.argpartition(-scores, top_k - 1)[:top_k]
+            order = order[np.argsort(-scores[order], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+
+        results = []
+        for i in order.tolist():
+            doc = scored_docs[i]
+            similarity = float(scores[i])
             # Determine action based on similarity
             if similarity > self.MERGE_THRESHOLD:
                 action = "merge"
@@ -273,9 +363,6 @@ class EmbeddingSearcher:
 
             print(f"    {emoji} {doc['title'][:50]}: {similarity:.3f} → {action.upper()}")
 
-        # Sort by similarity (highest first)
-        results.sort(key=lambda x: x[1], reverse=True)
-
         return results
 
     def process_topic(
@@ -309,8 +396,8 @@ class EmbeddingSearcher:
             print(f"   Mode Filter: {mode_filter}")
         print(f"{'='*80}")
 
-        # Find similar documents
-        results = self.find_similar_documents(new_topic, existing_documents, mode_filter=mode_filter)
+        # Find the most similar document (only the best match is used below)
+        results = self.find_similar_documents(new_topic, existing_documents, mode_filter=mode_filter, top_k=1)
 
         if not results or results[0][1] == 0.0:
             # No existing documents or no similarity
@@ -8,7 +8,8 @@ Determines whether a newly extracted topic should:
 - Verify with LLM (uncertain cases)
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import google.generativeai as genai
 
 
@@ -33,6 +34,49 @@ class MergeOrCreateDecision:
         self.merge_threshold = merge_threshold
         self.create_threshold = create_threshold
 
+    def _candidate_matrix(self, existing_documents: List[Dict], dim: int) -> Tuple[List[Dict], np.ndarray]:
+        """
+        Stack candidate embeddings into one contiguous (N, dim) float32 matrix.
+
+        Documents whose embedding has a different dimension (e.g. stored with
+        another embedding model) cannot be compared and are skipped.
+
+        Args:
+            existing_documents: List of existing document dicts
+            dim: Embedding dimension of the topic being compared
+
+        Returns:
+            Tuple of (documents with usable embeddings, matrix with one row per document)
+        """
+        candidates = []
+        candidate_embeddings = []
+
+        for doc in existing_documents:
+            # Use STORED embedding if available (CRITICAL: don't regenerate!)
+            if 'embedding' in doc and doc['embedding']:
+                doc_embedding = doc['embedding']
+            else:
+                # Fallback: create embedding only if not stored
+                # Use title + summary for consistency with how embeddings were created
+                doc_text = f"{doc.get('title', '')}. {doc.get('summary', '')}"
+                doc_embedding = self.embedder.create_embedding(doc_text)
+
+            if doc_embedding is None or len(doc_embedding) == 0:
+                continue  # Skip if embedding failed
+
+            if len(doc_embedding) != dim:
+                print(f"  ⚠️  Skipping {doc.get('id', 'document')}: embedding dimension {len(doc_embedding)} != {dim}")
+                continue
+
+            candidates.append(doc)
+            candidate_embeddings.append(doc_embedding)
+
+        matrix = np.empty((len(candidate_embeddings), dim), dtype=np.float32)
+        for row, doc_embedding in zip(matrix, candidate_embeddings):
+            row[:] = doc_embedding
+
+        return candidates, matrix
+
     def decide(self, topic: Dict, existing_documents: List[Dict], use_llm_verification: bool = True) -> Dict:
         """
         Decide whether to merge topic into existing doc or create new one.
@@ -61,29 +105,20 @@ class MergeOrCreateDecision:
             topic_text = f"{topic.get('title', '')}. {topic.get('summary', topic.get('content', ''))}"
             topic_embedding = self.embedder.create_embedding(topic_text)
 
-        # Find best matching document
+        # Find best matching document (one matmul over all candidates)
         best_match = None
         best_similarity = 0.0
 
-        for doc in existing_documents:
-            # Use STORED embedding if available (CRITICAL: don't regenerate!)
-            if 'embedding' in doc and doc['embedding']:
-                doc_embedding = doc['embedding']
-            else:
-                # Fallback: create embedding only if not stored
-                # Use title + summary for consistency with how embeddings were created
-                doc_text = f"{doc.get('title', '')}. {doc.get('summary', '')}"
-                doc_embedding = self.embedder.create_embedding(doc_text)
-
-            if not doc_embedding:
-                continue  # Skip if embedding failed
-
-            # Calculate similarity
-            similarity = self.embedder.calculate_similarity(topic_embedding, doc_embedding)
+        if topic_embedding:
+            # Stored embeddings for all candidate documents as one (N, dim) matrix
+            candidates, candidate_matrix = self._candidate_matrix(existing_documents, len(topic_embedding))
 
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = doc
+            if candidates:
+                scores = self.embedder.similarity_scores(topic_embedding, candidate_matrix)
+                best_index = int(scores.argmax())
+                if scores[best_index] > 0:
+                    best_similarity = float(scores[best_index])
+                    best_match = candidates[best_index]
 
         # Make decision based on similarity
         if best_similarity >= self.merge_threshold:
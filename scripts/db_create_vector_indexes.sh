@@ -0,0 +1,15 @@
+#!/bin/bash
+# Create HNSW indexes so similarity search (ORDER BY embedding <=> query LIMIT k)
+# runs as an approximate nearest-neighbour lookup inside PostgreSQL
+
+echo "🗂️  Creating vector indexes"
+echo "════════════════════════════════════════════════"
+
+docker exec postgres-crawl4ai psql -U postgres -d crawl4ai -c "
+CREATE INDEX IF NOT EXISTS idx_documents_embedding_hnsw
+ON documents USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX IF NOT EXISTS idx_chunks_embedding_hnsw
+ON chunks USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+"
+
+echo "✅ Done"
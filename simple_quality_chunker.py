@@ -10,6 +10,10 @@ import re
 from typing import List, Dict
 from datetime import datetime
 
+# Compiled once at import; _split_into_sentences runs for every document chunked
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])|(?<=\n)\s*(?=\S)')
+_CLAUSE_BOUNDARY_RE = re.compile(r'([,;])\s+')
+
 
 class SimpleQualityChunker:
     """
@@ -130,7 +134,7 @@ class SimpleQualityChunker:
         text = text.strip()
 
         # Split by common sentence boundaries
-        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])|(?<=\n)\s*(?=\S)', text)
+        sentences = _SENTENCE_BOUNDARY_RE.split(text)
 
         # Clean up and filter
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -140,7 +144,7 @@ class SimpleQualityChunker:
         for sentence in sentences:
             if self.estimate_tokens(sentence) > self.max_tokens:
                 # Split long sentences at commas, semicolons
-                parts = re.split(r'([,;])\s+', sentence)
+                parts = _CLAUSE_BOUNDARY_RE.split(sentence)
                 current_part = ""
                 for i, part in enumerate(parts):
                     if i % 2 == 0:  # Actual text part
@@ -0,0 +1,101 @@
+"""
+On-disk embedding cache for the live-API test scripts
+
+Workflow tests embed the same literal strings on every run. install() wraps
+an embedder's create_embeddings_batch so texts embedded in an earlier run are
+read from a local SQLite file instead of calling Gemini again.
+
+Only for tests whose subject is not the embedding API: cached vectors can't
+catch a Gemini response or parser regression. Don't install it in tests that
+check batch responses, parse formats, API timing or API results.
+"""
+
+import hashlib
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+
+CACHE_PATH = os.getenv(
+    'TEST_EMBEDDING_CACHE',
+    os.path.expanduser('~/.cache/crawl4ai_test_embeddings.sqlite')
+)
+
+# Stay under SQLite's bound-parameter limit
+_QUERY_BATCH = 500
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache (one connection per call, so it is safe from any thread)"""
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, dim INT, vec BLOB)"
+    )
+    return conn
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _load(keys: list) -> dict:
+    """Fetch cached vectors for the given hashes"""
+    unique = list(set(keys))
+    found = {}
+    with closing(_connect()) as conn:
+        for i in range(0, len(unique), _QUERY_BATCH):
+            batch = unique[i:i + _QUERY_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", batch
+            )
+            for key, vec in rows:
+                found[key] = np.frombuffer(vec, dtype=np.float32).tolist()
+    return found
+
+
+def _store(rows: list) -> None:
+    """Save (hash, embedding) pairs"""
+    with closing(_connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (hash, dim, vec) VALUES (?, ?, ?)",
+            [(key, len(emb), np.asarray(emb, dtype=np.float32).tobytes()) for key, emb in rows]
+        )
+
+
+def install(embedder):
+    """
+    Route embedder.create_embeddings_batch through the disk cache
+
+    Only texts missing from the cache are sent to the real batch API; the
+    results are reassembled in input order.
+
+    Args:
+        embedder: DocumentCreator or DocumentMerger instance
+
+    Returns:
+        The same embedder (patched in place)
+    """
+    batch_embed = embedder.create_embeddings_batch
+
+    def create_embeddings_batch(texts: list) -> list:
+        if not texts:
+            return []
+
+        keys = [_hash(text) for text in texts]
+        cached = _load(keys)
+        embeddings = [cached.get(key) for key in keys]
+
+        missing = [i for i, emb in enumerate(embeddings) if emb is None]
+        if missing:
+            fresh = batch_embed([texts[i] for i in missing])
+            for i, emb in zip(missing, fresh):
+                embeddings[i] = emb
+            _store([(keys[i], embeddings[i]) for i in missing if embeddings[i] is not None])
+
+        return embeddings
+
+    embedder.create_embeddings_batch = create_embeddings_batch
+    return embedder
@@ -0,0 +1,25 @@
+"""GEMINI_API_KEY check for the tests that call the live Gemini API.
+
+Call require_gemini_key() at import time, before anything builds a
+DocumentCreator/DocumentMerger. Run as a script, a missing key exits with an
+error; under pytest the module is skipped instead, so collection of the
+offline tests is not aborted.
+"""
+
+import os
+import sys
+
+
+def require_gemini_key() -> str:
+    """Return GEMINI_API_KEY, or skip/exit when it is not set."""
+    api_key = os.getenv('GEMINI_API_KEY')
+    if api_key:
+        return api_key
+
+    message = "GEMINI_API_KEY environment variable not set"
+    if 'pytest' in sys.modules:
+        import pytest
+        pytest.skip(message, allow_module_level=True)
+
+    print(f"❌ {message}")
+    sys.exit(1)
@@ -3,6 +3,8 @@
 Verify the batch parsing fix works correctly
 """
 
+import numpy as np
+
 def fixed_parsing(result_format_name, result_data, batch_size):
     """The FIXED parsing logic"""
 
@@ -27,25 +29,12 @@ def fixed_parsing(result_format_name, result_data, batch_size):
 
     # THIS IS THE FIXED PARSING LOGIC
     if hasattr(result, 'embedding'):
-        emb = result.embedding
-        print(f"  Found result.embedding (len={len(emb) if isinstance(emb, list) else 'N/A'})")
-
-        if isinstance(emb, list) and len(emb) > 0 and isinstance(emb[0], list):
-            # Nested structure detected
-            # Check if it's double-nested: [[emb1, emb2, emb3, ...]] (all embeddings in one wrapper)
-            if len(emb) == 1 and isinstance(emb[0], list) and len(emb[0]) == len(batch):
-                # Double-nested case: [[emb1, emb2, ...]] where inner list has ALL embeddings
-                print(f"  🔍 Detected double-nested format (len(emb)=1, len(emb[0])={len(emb[0])})")
-                print(f"  → Flattening by extracting emb[0]")
-                all_embeddings.extend(emb[0])  # Extract the inner list with all embeddings
-            else:
-                # Regular nested: [[emb1], [emb2], [emb3], ...] (each embedding wrapped separately)
-                print(f"  → Regular nested format (len(emb)={len(emb)})")
-                all_embeddings.extend(emb)
-        else:
-            # Flat: [...]
-            print(f"  → Flat format")
-            all_embeddings.append(emb)
+        # One array probe replaces the isinstance ladder: flat (dim,),
+        # regular nested (n, 1, dim), plain (n, dim) and double-nested
+        # (1, n, dim) all reshape to one row per embedding
+        emb = np.asarray(result.embedding, dtype=float)
+        print(f"  Found result.embedding (shape={emb.shape})")
+        all_embeddings.extend(emb.reshape(-1, emb.shape[-1]).tolist())
 
     elif hasattr(result, 'embeddings'):
         print(f"  Found result.embeddings")
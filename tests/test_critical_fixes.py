@@ -8,8 +8,10 @@ from dotenv import load_dotenv
 from chunked_document_database import SimpleDocumentDatabase
 from merge_or_create_decision import MergeOrCreateDecision
 from embedding_search import EmbeddingSearcher
+from _gemini_key import require_gemini_key
 
 load_dotenv()
+require_gemini_key()
 
 print("="*80)
 print("TESTING CRITICAL FIXES")
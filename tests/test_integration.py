@@ -19,11 +19,8 @@ from typing import List, Dict
 
 # Test configuration
 TEST_MODE = True
-os.environ['GEMINI_API_KEY'] = os.getenv('GEMINI_API_KEY', '')
-
-if not os.environ['GEMINI_API_KEY']:
-    print("❌ GEMINI_API_KEY not set in .env file")
-    sys.exit(1)
+from _gemini_key import require_gemini_key
+require_gemini_key()
 
 
 class IntegrationTester:
@@ -1,19 +1,16 @@
 #!/usr/bin/env python3
 """Comprehensive test of workflow_manager.py to ensure it runs properly without errors"""
 
-import os
 import sys
+from _gemini_key import require_gemini_key
 
 print("=" * 80)
 print("WORKFLOW MANAGER COMPREHENSIVE TEST")
 print("=" * 80)
 print()
 
-# Set API key
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
-    print("❌ GEMINI_API_KEY not set")
-    sys.exit(1)
+# Live Gemini API test: needs a key
+GEMINI_API_KEY = require_gemini_key()
 
 # Test 1: Import workflow_manager
 print("TEST 1: Import workflow_manager")
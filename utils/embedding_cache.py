@@ -0,0 +1,67 @@
+"""Process-wide LRU cache of document embeddings.
+
+DocumentCreator and DocumentMerger embed with the same model and task type,
+so a text embedded by one (e.g. chunk content that is carried into a merge)
+is served to the other without another Gemini API call. Keys are BLAKE2b
+digests of the text, so the cache does not keep the texts themselves alive.
+All access goes through a lock: the web UI runs workflows on background threads.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+MAX_ENTRIES = 4096
+
+_cache: "OrderedDict[bytes, list]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def get(text: str) -> Optional[list]:
+    """Return the cached embedding for text, or None."""
+    key = _key(text)
+    with _lock:
+        embedding = _cache.get(key)
+        if embedding is not None:
+            _cache.move_to_end(key)
+    return embedding
+
+
+def put(text: str, embedding: Optional[list]) -> None:
+    """Cache an embedding (failed embeddings are not cached)."""
+    if embedding is None:
+        return
+    key = _key(text)
+    with _lock:
+        _cache[key] = embedding
+        _cache.move_to_end(key)
+        if len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def lookup(texts: List[str]) -> Tuple[List[Optional[list]], List[int]]:
+    """Split texts into cache hits and misses.
+
+    Returns:
+        Tuple of (embeddings with hits filled in and None for misses,
+        indices of the texts that still need embedding)
+
+    Examples:
+        >>> put("cached text", [0.1, 0.2])
+        >>> lookup(["cached text", "new text"])
+        ([[0.1, 0.2], None], [1])
+    """
+    embeddings = [get(text) for text in texts]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    return embeddings, missing
+
+
+def clear() -> None:
+    """Drop all cached embeddings."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,239 @@
+"""Parsing of Gemini batch embedding responses.
+
+The Gemini SDK has returned batch embeddings in several shapes over time
+(dicts, objects with ``.embedding`` or ``.embeddings``, plain lists, and the
+double-nested ``[[emb1, emb2, ...]]`` wrapper). Both DocumentCreator and
+DocumentMerger share this parser so the format handling lives in one place.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+BatchParser = Callable[[Any, list], List[list]]
+
+SUPPORTED_DTYPES = ("float32", "int8", "bfloat16")
+
+
+def _probe_shape(emb: Any, batch: list) -> Tuple[bool, int, bool]:
+    """Classify an ``embedding`` payload in a single pass.
+
+    Returns:
+        Tuple of (first_is_list, outer_len, inner_matches_batch)
+    """
+    outer = len(emb) if isinstance(emb, list) else 0
+    first_is_list = outer > 0 and isinstance(emb[0], list)
+    inner = len(emb[0]) if first_is_list else 0
+    return first_is_list, outer, inner == len(batch)
+
+
+def _extend_nested(emb: Any, batch: list, all_embeddings: List[list]) -> None:
+    """Extend with a ``.embedding`` style payload (flat, nested or double-nested)."""
+    match _probe_shape(emb, batch):
+        case (False, _, _):
+            # Flat: [...]
+            all_embeddings.append(emb)
+        case (True, 1, True):
+            # Double-nested: [[emb1, emb2, ...]] where inner list has ALL embeddings
+            all_embeddings.extend(emb[0])
+        case _:
+            # Regular nested: [[emb1], [emb2], ...] (each embedding wrapped separately)
+            all_embeddings.extend(emb)
+
+
+def _parse_embedding_attr(result: Any, batch: list) -> List[list]:
+    """Parse an object exposing ``result.embedding``."""
+    all_embeddings = []
+    _extend_nested(result.embedding, batch, all_embeddings)
+    return all_embeddings
+
+
+def _parse_embeddings_attr(result: Any, batch: list) -> List[list]:
+    """Parse an object exposing ``result.embeddings`` (one entry per text)."""
+    all_embeddings = []
+    for emb in result.embeddings:
+        if hasattr(emb, 'values'):
+            all_embeddings.append(emb.values)
+        elif isinstance(emb, list):
+            all_embeddings.append(emb)
+        else:
+            all_embeddings.append(list(emb))
+    return all_embeddings
+
+
+def _parse_dict(result: Dict, batch: list) -> List[list]:
+    """Parse a dict response with an ``embedding`` or ``embeddings`` key."""
+    all_embeddings = []
+
+    if 'embedding' in result:
+        emb = result['embedding']
+        match _probe_shape(emb, batch):
+            case (True, 1, True):
+                # Double-nested: [[emb1, emb2, ...]]
+                all_embeddings.extend(emb[0])
+            case (True, _, _):
+                # Multiple embeddings, each wrapped: [[emb1], [emb2], ...]
+                all_embeddings.extend(emb)
+            case (False, outer, _) if (
+                0 < outer == len(batch)
+                and hasattr(emb[0], '__len__') and len(emb[0]) > 1
+            ):
+                # Multiple flat embeddings whose items look like vectors (e.g. tuples)
+                all_embeddings.extend(emb)
+            case _:
+                # Single embedding vector
+                all_embeddings.append(emb)
+
+    elif 'embeddings' in result:
+        for emb_data in result['embeddings']:
+            if isinstance(emb_data, dict) and 'values' in emb_data:
+                all_embeddings.append(emb_data['values'])
+            elif isinstance(emb_data, list):
+                all_embeddings.append(emb_data)
+            else:
+                all_embeddings.append(list(emb_data))
+
+    else:
+        return _parse_unknown(result, batch)
+
+    return all_embeddings
+
+
+def _parse_list(result: list, batch: list) -> List[list]:
+    """Parse a direct list of embeddings ``[[...], [...]]``."""
+    return list(result)
+
+
+def _parse_unknown(result: Any, batch: list) -> List[list]:
+    """Last resort: try to iterate the result."""
+    print(f"  ⚠️  Unknown embedding result format: {type(result)}")
+    return list(result)
+
+
+def _shape_key(result: Any) -> Tuple[type, bool, bool]:
+    """Response class plus which of ``embedding``/``embeddings`` it carries.
+
+    One class can carry either field (e.g. a dict, or an SDK object whose
+    fields are optional), so the class alone does not pick the parser.
+    """
+    if isinstance(result, dict):
+        return type(result), 'embedding' in result, 'embeddings' in result
+    return type(result), hasattr(result, 'embedding'), hasattr(result, 'embeddings')
+
+
+def _pick_parser(key: Tuple[type, bool, bool]) -> BatchParser:
+    """Choose the parser for a response shape (runs once per shape)."""
+    result_type, has_embedding, has_embeddings = key
+    if issubclass(result_type, dict):
+        return _parse_dict
+    if issubclass(result_type, list):
+        return _parse_list
+    if has_embedding:
+        return _parse_embedding_attr
+    if has_embeddings:
+        return _parse_embeddings_attr
+    return _parse_unknown
+
+
+# Response shape -> parser. Populated lazily so the dispatch decision is
+# only made the first time a response shape is seen.
+_PARSERS: Dict[Tuple[type, bool, bool], BatchParser] = {}
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization.
+
+    Args:
+        matrix: float32 embeddings, one vector per row (last axis)
+
+    Returns:
+        Tuple of (int8 matrix, float32 per-row scales); an empty matrix gives
+        empty results
+
+    Examples:
+        >>> quantized, scales = quantize_int8(np.empty((0, 0), dtype=np.float32))
+        >>> quantized.shape, scales.shape
+        ((0, 0), (0,))
+    """
+    # initial=0 so an empty matrix (e.g. a batch that parsed to nothing)
+    # reduces to no rows instead of raising
+    max_abs = np.max(np.abs(matrix), axis=-1, keepdims=True, initial=0.0)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    quantized = np.round(matrix / scales).astype(np.int8)
+    return quantized, scales.squeeze(-1)
+
+
+def dequantize_int8(quantized: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Inverse of quantize_int8 (lossy)."""
+    return quantized.astype(np.float32) * scales[..., np.newaxis]
+
+
+def to_bfloat16_bits(matrix: np.ndarray) -> np.ndarray:
+    """Truncate float32 to bfloat16, returned as raw uint16 bit patterns."""
+    return (np.ascontiguousarray(matrix, dtype=np.float32).view(np.uint32) >> 16).astype(np.uint16)
+
+
+def from_bfloat16_bits(bits: np.ndarray) -> np.ndarray:
+    """Widen raw bfloat16 bit patterns back to float32."""
+    return (bits.astype(np.uint32) << 16).view(np.float32)
+
+
+def parse_batch_result(
+    result: Any,
+    batch: list,
+    *,
+    dtype: str = "float32"
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """Extract embeddings from a Gemini batch ``embed_content`` response.
+
+    The parser is chosen once per response shape (class plus which
+    embedding field it carries) and cached, so repeated batches of the same
+    shape skip the dispatch. The
+    embeddings are materialized straight into a contiguous float32 matrix;
+    callers that still need plain lists can use ``.tolist()``. Every
+    supported response format yields the same ``(n, dim)`` shape.
+
+    Args:
+        result: Raw response returned by ``genai.embed_content``
+        batch: Texts that were sent in this request (used to detect the
+            double-nested format)
+        dtype: Storage format for the returned embeddings:
+            - "float32": plain float32 matrix (default)
+            - "int8": per-row scaled int8, returned as ``(matrix, scales)``
+            - "bfloat16": truncated bfloat16 as raw uint16 bits
+
+    Returns:
+        ``(len(embeddings), dim)`` array, rows in the same order as ``batch``
+        (a ``(matrix, scales)`` tuple for ``dtype="int8"``)
+
+    Raises:
+        ValueError: If the embeddings do not all have the same dimension,
+            or ``dtype`` is not supported
+
+    Examples:
+        >>> parse_batch_result([[0.5, 0.25], [1.0, 2.0]], ['a', 'b']).shape
+        (2, 2)
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported dtype '{dtype}', expected one of {SUPPORTED_DTYPES}")
+
+    key = _shape_key(result)
+    parser = _PARSERS.get(key)
+    if parser is None:
+        parser = _pick_parser(key)
+        _PARSERS[key] = parser
+
+    embeddings = parser(result, batch)
+    if embeddings:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 3 and matrix.shape[1] == 1:
+            # Individually wrapped [[emb1], [emb2], ...] -> (n, dim)
+            matrix = matrix[:, 0]
+    else:
+        matrix = np.empty((0, 0), dtype=np.float32)
+
+    if dtype == "int8":
+        return quantize_int8(matrix)
+    if dtype == "bfloat16":
+        return to_bfloat16_bits(matrix)
+    return matrix